@@ -1,8 +1,34 @@
+import math
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib as mpl
 
+try:
+    # Ahead-of-time compiled kernels, built with build_kernels.py
+    from ballmill_kernels import cs_scalar, cs_vec
+    HAVE_AOT_KERNELS = True
+except ImportError:
+    HAVE_AOT_KERNELS = False
+
+# Numba is only needed to JIT the kernels when no AOT build is available
+HAVE_NUMBA = False
+if not HAVE_AOT_KERNELS:
+    try:
+        from numba import njit, vectorize
+        HAVE_NUMBA = True
+    except ImportError:
+        pass
+
+if not HAVE_NUMBA:
+    # Without Numba the kernels run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
 # Set up a professional-looking style
 plt.rcParams['axes.grid'] = True
 plt.rcParams['grid.linestyle'] = '--'
@@ -17,6 +43,19 @@ mpl.rcParams['figure.figsize'] = [12, 8]
 
 # Constants
 g = 9.81  # Acceleration due to gravity (m/s^2)
+_K = 60.0 / (2.0 * math.pi)  # Converts rad/s to RPM: 60 / (2π)
+
+# Compiled scalar kernel for the critical speed (RPM)
+if HAVE_AOT_KERNELS:
+    _cs_scalar = cs_scalar
+else:
+    @njit(cache=True, fastmath=True)
+    def _cs_scalar(ball_diam_cm, cyl_diam_cm):
+        ball_radius_m = ball_diam_cm * 0.005
+        cylinder_radius_m = cyl_diam_cm * 0.005
+        if cylinder_radius_m <= ball_radius_m:
+            return 0.0
+        return _K * math.sqrt(g / (cylinder_radius_m - ball_radius_m))
 
 # Function to calculate critical speed
 def critical_speed(ball_diam_cm, cylinder_diam_cm):
@@ -30,50 +69,101 @@ def critical_speed(ball_diam_cm, cylinder_diam_cm):
     Returns:
     float: Critical speed in RPM
     """
-    # Convert to meters and calculate radii
-    ball_radius_m = (ball_diam_cm / 100) / 2
-    cylinder_radius_m = (cylinder_diam_cm / 100) / 2
+    return _cs_scalar(float(ball_diam_cm), float(cylinder_diam_cm))
+
+# Vectorized critical speed over an array of cylinder diameters
+def critical_speed_vec(ball_diam_cm, cyl_diams_cm, out=None):
+    """
+    Calculate critical speeds of a ball mill for many cylinder diameters
     
-    # Check for valid dimensions
-    if cylinder_radius_m <= ball_radius_m:
-        return 0
+    Parameters:
+    ball_diam_cm (float): Ball diameter in cm
+    cyl_diams_cm (ndarray): Cylinder diameters in cm
+    out (ndarray, optional): Array to write the results into
     
-    # Calculate critical speed (revolutions per second)
-    critical_speed_rps = (1 / (2 * np.pi)) * np.sqrt(g / (cylinder_radius_m - ball_radius_m))
+    Returns:
+    ndarray: Critical speeds in RPM (0 where the cylinder is not larger than the ball)
+    """
+    ball_radius_m = ball_diam_cm / 200.0
+    cylinder_radius_m = cyl_diams_cm / 200.0
     
-    # Convert to RPM
-    return critical_speed_rps * 60
+    # Branch-free: evaluate every element, then mask out invalid geometries
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = np.maximum(cylinder_radius_m - ball_radius_m, 1e-300)
+        speeds = np.where(cylinder_radius_m > ball_radius_m, _K * np.sqrt(g / denom), 0.0)
+    if out is None:
+        return speeds
+    out[...] = speeds
+    return out
+
+# Curve kernel used by the plot: the AOT kernel if built, else a Numba ufunc
+if HAVE_AOT_KERNELS:
+    def cs_uf(ball_diam_cm, cyl_diams_cm, out=None):
+        # The compiled loop reads raw float64 memory with no dtype or bounds
+        # checks, so coerce the input and validate the output buffer here
+        cyl_diams_cm = np.asarray(cyl_diams_cm, dtype=np.float64, order='C')
+        if out is None:
+            out = np.empty(cyl_diams_cm.shape, np.float64)
+        elif (out.dtype != np.float64 or out.shape != cyl_diams_cm.shape
+                or not out.flags.c_contiguous):
+            raise ValueError(f"out must be a C-contiguous float64 array of shape "
+                             f"{cyl_diams_cm.shape}, got {out.dtype} {out.shape}")
+        cs_vec(float(ball_diam_cm), cyl_diams_cm.reshape(-1), out.reshape(-1))
+        return out
+elif HAVE_NUMBA:
+    @vectorize(['f8(f8,f8)'], fastmath=True, cache=True)
+    def cs_uf(ball_diam_cm, cyl_diam_cm):
+        ball_radius_m = ball_diam_cm * 0.005
+        cylinder_radius_m = cyl_diam_cm * 0.005
+        if cylinder_radius_m <= ball_radius_m:
+            return 0.0
+        # fastmath may evaluate this before the guard, so keep the divisor non-zero
+        return _K * math.sqrt(g / max(cylinder_radius_m - ball_radius_m, 1e-12))
+else:
+    cs_uf = critical_speed_vec
 
 # Create the figure
 fig, (ax, ax_info) = plt.subplots(1, 2, figsize=(14, 8), gridspec_kw={'width_ratios': [3, 1]})
-plt.subplots_adjust(bottom=0.25, top=0.92, left=0.08, right=0.95, wspace=0.2)
+plt.subplots_adjust(bottom=0.2, top=0.88, left=0.08, right=0.92, wspace=0.12)
 
 # Set main plot title
 fig.suptitle("Ball Mill Critical Speed Analyzer", fontsize=18, fontweight='bold')
 
 # Initial values
 initial_ball_diam = 1.5  # cm
-cylinder_diams = np.linspace(5, 50, 100)  # Cylinder diameters from 5 to 50 cm
+cylinder_diams = np.linspace(5.0, 50.0, 100, dtype=np.float64)  # Cylinder diameters from 5 to 50 cm (contiguous float64)
+
+# Warm up the scalar kernel so the first click does not pay for JIT compilation
+_cs_scalar(initial_ball_diam, 10.0)
 
-# Calculate initial critical speeds
-critical_speeds = [critical_speed(initial_ball_diam, d) for d in cylinder_diams]
+# Calculate initial critical speeds (this also compiles the curve ufunc)
+critical_speeds = cs_uf(initial_ball_diam, cylinder_diams)
+
+# Preallocated buffer the slider writes each new curve into
+speed_buffer = np.empty_like(cylinder_diams)
 
 # Plot the initial curve
 line, = ax.plot(critical_speeds, cylinder_diams, 'b-', linewidth=2.5, 
-                label=f'Ball Diameter: {initial_ball_diam} cm')
+                label=f'Ball Diameter: {initial_ball_diam} cm', animated=True)
 ax.set_xlabel('Critical Speed (RPM)', fontsize=14, fontweight='bold')
 ax.set_ylabel('Cylinder Diameter (cm)', fontsize=14, fontweight='bold')
 ax.set_title('Critical Speed vs Cylinder Diameter', fontsize=16)
 ax.grid(True, alpha=0.4)
 ax.set_ylim(5, 50)
-ax.set_xlim(0, max(critical_speeds) * 1.1)
+# Curve maximum the x-limits were last set from (the toolbar may change the view)
+auto_xmax = float(critical_speeds.max())
+ax.set_xlim(0, auto_xmax * 1.1)
 
 # Add a reference line for 70% of critical speed
 seventy_percent_line = ax.axvline(x=0, color='g', linestyle='--', alpha=0.7, 
-                                  label='70% of Critical Speed (Recommended)')
+                                  label='70% of Critical Speed (Recommended)', animated=True)
+# Preallocated x-data of the vertical 70% line (both ends share the same x)
+seventy_percent_x = np.zeros(2, dtype=np.float64)
+seventy_percent_line.set_xdata(seventy_percent_x)
 
-# Add legend
-ax.legend(loc='upper right', frameon=True)
+# Add legend (created once; its text is updated in place)
+legend = ax.legend(loc='upper right', frameon=True)
+legend.set_animated(True)
 
 # Add a slider for ball diameter
 ax_ball = plt.axes([0.25, 0.1, 0.5, 0.03])
@@ -85,18 +175,34 @@ ball_slider = Slider(
     valinit=initial_ball_diam,
     valstep=0.1
 )
+# The slider is redrawn by blitting together with the curve
+ball_slider.drawon = False
+ax_ball.set_animated(True)
 
 # Text boxes for click results
 click_result_text = ax.text(0.05, 0.95, "Click on a cylinder diameter to see critical speed", 
                            transform=ax.transAxes, fontsize=11, verticalalignment='top',
                            bbox=dict(facecolor='white', alpha=0.8))
 
+# Result text for the clicked point, created once and updated with set_text
+RESULT_TEMPLATE = "Cylinder Diameter: %.1f cm\n" \
+                  "Ball Diameter: %.1f cm\n" \
+                  "Critical Speed: %.1f RPM\n" \
+                  "70%% Recommended: %.1f RPM"
+click_text = ax.text(0.05, 0.85, "", transform=ax.transAxes, fontsize=11,
+                     verticalalignment='top', bbox=dict(facecolor='white', alpha=0.9),
+                     animated=True)
+
 # Add physics explanation to the info panel
 ax_info.set_title("Physics of Ball Mill Critical Speed", fontsize=14)
 ax_info.set_axis_off()
 
-physics_text = """
-The critical speed is the rotational speed at which grinding balls are pinned to the inner wall of the mill due to centrifugal force, preventing them from cascading down to perform grinding operations.
+physics_text = """\
+The critical speed is the rotational speed at
+which grinding balls are pinned to the inner
+wall of the mill due to centrifugal force,
+preventing them from cascading down to
+perform grinding operations.
 
 Formula:
     N_c = (1 / (2π)) × √(g / (R - r)) × 60
@@ -108,25 +214,52 @@ Where:
     r = Ball radius (meters)
 
 Key Relationships:
-- As cylinder size increases, critical speed decreases
+- As cylinder size increases, critical
+  speed decreases
 - Larger balls require lower critical speeds
-- Optimal operation is typically at 65-80% of critical speed
-"""
-ax_info.text(0.02, 0.98, physics_text, fontsize=11, 
-             ha='left', va='top', wrap=True)
+- Optimal operation is typically at 65-80%
+  of critical speed"""
 
 # Add key relationships
-ax_info.text(0.02, 0.25, "Practical Guidelines:", 
-             fontsize=12, fontweight='bold', ha='left', va='top')
-guidelines = """
+guidelines = """\
 • Critical speed: Full centrifuging speed
 • Recommended speed: 70% of critical speed
 • For nano grinding: 70-100 RPM
 • Ball size: 0.5-2mm for nano particles
-• Cylinder size: 10-20cm for lab mills
-"""
-ax_info.text(0.05, 0.20, guidelines, fontsize=11, 
-             ha='left', va='top', wrap=True)
+• Cylinder size: 10-20cm for lab mills"""
+
+def add_info_text(ax):
+    ax.text(0.02, 0.98, physics_text, fontsize=11, 
+            ha='left', va='top')
+    ax.text(0.02, 0.24, "Practical Guidelines:", 
+            fontsize=12, fontweight='bold', ha='left', va='top')
+    ax.text(0.05, 0.19, guidelines, fontsize=11, 
+            ha='left', va='top')
+    ax.set_axis_off()
+
+# Render the info text on a private Agg canvas covering only the region below
+# the panel's top and right of its left edge (the longest lines run past the
+# panel); the text axes keeps the panel's size so the layout is unchanged
+def render_info_text(position):
+    region_width = 1 - position.x0
+    region_height = position.y1
+    fig_width, fig_height = fig.get_size_inches()
+    panel_fig = Figure(figsize=(fig_width * region_width, fig_height * region_height), dpi=fig.dpi)
+    panel_fig.patch.set_alpha(0)
+    canvas = FigureCanvasAgg(panel_fig)
+    add_info_text(panel_fig.add_axes([0, position.y0 / region_height,
+                                      position.width / region_width,
+                                      position.height / region_height]))
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())
+
+# Add the info text to the panel as a single image
+info_bbox = ax_info.get_position()
+ax_info_image = fig.add_axes([info_bbox.x0, 0, 1 - info_bbox.x0, info_bbox.y1])
+info_image = ax_info_image.imshow(np.zeros((1, 1, 4)), extent=(0, 1, 0, 1),
+                                  aspect='auto', interpolation='antialiased')
+ax_info_image.set_axis_off()
+ax_info_image.set_navigate(False)
 
 # Add a diagram of a ball mill
 def add_mill_diagram(ax):
@@ -154,17 +287,103 @@ def add_mill_diagram(ax):
     
     ax.set_axis_off()
 
-# Add diagram to the info panel
+# Render the diagram to an RGBA bitmap on a private Agg canvas
+def render_mill_diagram(width_in, height_in, dpi):
+    diagram_fig = Figure(figsize=(width_in, height_in), dpi=dpi)
+    diagram_fig.patch.set_alpha(0)
+    canvas = FigureCanvasAgg(diagram_fig)
+    add_mill_diagram(diagram_fig.add_axes([0, 0, 1, 1]))
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())
+
+# Add diagram to the info panel as a single image
 ax_diagram = fig.add_axes([0.75, 0.55, 0.15, 0.3])
-add_mill_diagram(ax_diagram)
+diagram_image = ax_diagram.imshow(np.zeros((1, 1, 4)), extent=(0, 1, 0, 1),
+                                  aspect='auto', interpolation='antialiased')
+ax_diagram.set_axis_off()
+
+# Figure size in device pixels the static bitmaps were last rendered at
+static_images_size = None
 
-# Variables to store click markers
+def render_static_images():
+    """
+    Render the info text and diagram bitmaps at the current figure size and dpi
+    
+    fig.dpi includes the device pixel ratio on HiDPI screens, so the bitmaps
+    always map 1:1 onto screen pixels. Returns True if they were re-rendered.
+    """
+    global static_images_size
+    size = (fig.bbox.width, fig.bbox.height)
+    if size == static_images_size:
+        return False
+    static_images_size = size
+    info_image.set_data(render_info_text(ax_info.get_position()))
+    diagram_bbox = ax_diagram.get_position()
+    diagram_image.set_data(render_mill_diagram(diagram_bbox.width * fig.get_figwidth(),
+                                               diagram_bbox.height * fig.get_figheight(),
+                                               fig.dpi))
+    return True
+
+render_static_images()
+
+# Re-render the bitmaps once a burst of resize events has settled (~150 ms)
+resize_timer = fig.canvas.new_timer(interval=150)
+resize_timer.single_shot = True
+resize_pending = False
+
+def on_resize(event):
+    global resize_pending
+    resize_pending = True
+    resize_timer.stop()
+    resize_timer.start()
+
+def on_resize_timer():
+    global resize_pending
+    resize_pending = False
+    if render_static_images():
+        fig.canvas.draw_idle()
+
+resize_timer.add_callback(on_resize_timer)
+fig.canvas.mpl_connect('resize_event', on_resize)
+
+# Variable to store the click marker
 click_marker = None
-click_text = None
+
+# Background of the static artists, captured on every full draw for blitting
+background = None
+# Savefig may temporarily swap in a PDF/SVG canvas; only this one is blitted
+interactive_canvas = fig.canvas
+
+def draw_animated(renderer):
+    for artist in (line, seventy_percent_line, legend, click_marker, click_text, ax_ball):
+        if artist is not None:
+            artist.draw(renderer)
+
+def on_draw(event):
+    global background
+    if event.canvas is interactive_canvas and not event.canvas.is_saving():
+        # The dpi can change without a resize (e.g. moving to a HiDPI screen)
+        if not resize_pending and render_static_images():
+            event.canvas.draw_idle()
+        if event.canvas.supports_blit:
+            background = event.canvas.copy_from_bbox(fig.bbox)
+    draw_animated(event.renderer)
+
+def blit():
+    # Fall back to a full redraw until a background is available
+    if background is None:
+        fig.canvas.draw_idle()
+        return
+    fig.canvas.restore_region(background)
+    draw_animated(fig.canvas.get_renderer())
+    fig.canvas.blit(fig.bbox)
+
+# Re-capture the background whenever the figure is fully drawn (startup, resize, zoom)
+fig.canvas.mpl_connect('draw_event', on_draw)
 
 # Click event handler
 def on_click(event):
-    global click_marker, click_text
+    global click_marker
     
     if event.inaxes != ax:
         return
@@ -181,40 +400,36 @@ def on_click(event):
     # Calculate 70% of critical speed
     seventy_percent = cs * 0.7
     
-    # Remove previous markers and text
+    # Remove previous marker
     if click_marker:
         click_marker.remove()
-    if click_text:
-        click_text.remove()
     
     # Add new marker and text
-    click_marker = ax.scatter(cs, cylinder_diam, s=80, c='red', marker='o', edgecolor='black', zorder=5)
-    
-    # Create text box with results
-    result_text = f"Cylinder Diameter: {cylinder_diam:.1f} cm\n" \
-                 f"Ball Diameter: {ball_diam:.1f} cm\n" \
-                 f"Critical Speed: {cs:.1f} RPM\n" \
-                 f"70% Recommended: {seventy_percent:.1f} RPM"
+    click_marker = ax.scatter(cs, cylinder_diam, s=80, c='red', marker='o', edgecolor='black', zorder=5,
+                              animated=True)
     
-    click_text = ax.text(0.05, 0.85, result_text, transform=ax.transAxes, fontsize=11,
-                         verticalalignment='top', bbox=dict(facecolor='white', alpha=0.9))
+    # Fill the text box with results
+    click_text.set_text(RESULT_TEMPLATE % (cylinder_diam, ball_diam, cs, seventy_percent))
     
     # Update the 70% line
-    seventy_percent_line.set_xdata(seventy_percent)
+    seventy_percent_x[:] = seventy_percent
+    seventy_percent_line.set_xdata(seventy_percent_x)
     
     # Update the plot
-    fig.canvas.draw_idle()
+    blit()
 
 # Connect the click event
 fig.canvas.mpl_connect('button_press_event', on_click)
 
 # Update function for slider
 def update(val):
+    global auto_xmax
     ball_diam = ball_slider.val
     # Update critical speeds for the new ball diameter
-    new_critical_speeds = [critical_speed(ball_diam, d) for d in cylinder_diams]
+    new_critical_speeds = cs_uf(ball_diam, cylinder_diams, out=speed_buffer)
     line.set_xdata(new_critical_speeds)
     line.set_label(f'Ball Diameter: {ball_diam:.1f} cm')
+    legend.get_texts()[0].set_text(line.get_label())
     
     # Update the 70% line position
     if click_marker:
@@ -222,37 +437,53 @@ def update(val):
         cylinder_diam = click_marker.get_offsets()[0][1]
         cs = critical_speed(ball_diam, cylinder_diam)
         seventy_percent = cs * 0.7
-        seventy_percent_line.set_xdata(seventy_percent)
+        seventy_percent_x[:] = seventy_percent
+        seventy_percent_line.set_xdata(seventy_percent_x)
         
         # Update the marker position
         click_marker.set_offsets([[cs, cylinder_diam]])
         
         # Update the text
-        if click_text:
-            result_text = f"Cylinder Diameter: {cylinder_diam:.1f} cm\n" \
-                          f"Ball Diameter: {ball_diam:.1f} cm\n" \
-                          f"Critical Speed: {cs:.1f} RPM\n" \
-                          f"70% Recommended: {seventy_percent:.1f} RPM"
-            click_text.set_text(result_text)
+        click_text.set_text(RESULT_TEMPLATE % (cylinder_diam, ball_diam, cs, seventy_percent))
     
-    # Update legend
-    ax.legend(loc='upper right', frameon=True)
-    
-    # Update x-axis limits
-    ax.set_xlim(0, max(new_critical_speeds) * 1.1)
-    
-    # Redraw
-    fig.canvas.draw_idle()
+    # Update x-axis limits when the maximum moves by more than 2% or the view
+    # was panned/zoomed away; new ticks need a full redraw, otherwise blit
+    new_max = float(new_critical_speeds.max())
+    if (abs(new_max - auto_xmax) > 0.02 * new_max
+            or tuple(ax.get_xlim()) != (0, auto_xmax * 1.1)):
+        auto_xmax = new_max
+        ax.set_xlim(0, new_max * 1.1)
+        fig.canvas.draw_idle()
+    else:
+        blit()
+
+# Coalesce rapid slider events into at most one update per frame (~16 ms)
+update_timer = fig.canvas.new_timer(interval=16)
+update_timer.single_shot = True
+update_pending = False
+
+def on_slider_changed(val):
+    global update_pending
+    if not update_pending:
+        update_pending = True
+        update_timer.start()
+
+def on_update_timer():
+    global update_pending
+    update_pending = False
+    update(ball_slider.val)
+
+update_timer.add_callback(on_update_timer)
 
 # Register update function with slider
-ball_slider.on_changed(update)
+ball_slider.on_changed(on_slider_changed)
 
 # Add reset button
 resetax = plt.axes([0.8, 0.05, 0.1, 0.04])
 reset_button = Button(resetax, 'Reset All', color='lightgoldenrodyellow', hovercolor='0.975')
 
 def reset(event):
-    global click_marker, click_text
+    global click_marker
     
     # Reset slider
     ball_slider.reset()
@@ -262,12 +493,11 @@ def reset(event):
         click_marker.remove()
         click_marker = None
     
-    if click_text:
-        click_text.remove()
-        click_text = None
+    click_text.set_text("")
     
     # Reset the 70% line
-    seventy_percent_line.set_xdata(0)
+    seventy_percent_x[:] = 0
+    seventy_percent_line.set_xdata(seventy_percent_x)
     
     # Reset the instruction text
     click_result_text.set_text("Click on a cylinder diameter to see critical speed")
@@ -277,5 +507,4 @@ def reset(event):
 
 reset_button.on_clicked(reset)
 
-plt.tight_layout()
 plt.show()
@@ -0,0 +1,43 @@
+"""
+Ahead-of-time compile the critical speed kernels used by BallMill_NC.py
+
+Run once with Numba installed:
+    python build_kernels.py
+
+This writes the ballmill_kernels extension module next to this script.
+BallMill_NC.py imports it when present, so the app starts without
+JIT compilation and without needing Numba at run time.
+"""
+import math
+import os
+
+from numba.pycc import CC
+
+# Constants (must match BallMill_NC.py)
+g = 9.81  # Acceleration due to gravity (m/s^2)
+K = 60.0 / (2.0 * math.pi)  # Converts rad/s to RPM: 60 / (2π)
+
+cc = CC('ballmill_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+@cc.export('cs_scalar', 'f8(f8, f8)')
+def cs_scalar(ball_diam_cm, cyl_diam_cm):
+    ball_radius_m = ball_diam_cm * 0.005
+    cylinder_radius_m = cyl_diam_cm * 0.005
+    if cylinder_radius_m <= ball_radius_m:
+        return 0.0
+    return K * math.sqrt(g / (cylinder_radius_m - ball_radius_m))
+
+@cc.export('cs_vec', 'void(f8, f8[:], f8[:])')
+def cs_vec(ball_diam_cm, cyl_diams_cm, out):
+    ball_radius_m = ball_diam_cm * 0.005
+    # AOT code has no bounds checking, so never write past either array
+    for i in range(min(cyl_diams_cm.shape[0], out.shape[0])):
+        cylinder_radius_m = cyl_diams_cm[i] * 0.005
+        if cylinder_radius_m <= ball_radius_m:
+            out[i] = 0.0
+        else:
+            out[i] = K * math.sqrt(g / (cylinder_radius_m - ball_radius_m))
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,87 @@
+import math
+import os
+import runpy
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BallMill_NC.py')
+
+@pytest.fixture
+def app(monkeypatch):
+    # Run the script headless: plt.show() must not block
+    monkeypatch.setattr(plt, 'show', lambda *args, **kwargs: None)
+    namespace = runpy.run_path(SCRIPT)
+    yield namespace
+    plt.close(namespace['fig'])
+
+def baseline_critical_speed(ball_diam_cm, cylinder_diam_cm):
+    # The original formula: N_c = (1 / (2π)) × √(g / (R - r)) × 60, 0 if R <= r
+    ball_radius_m = (ball_diam_cm / 100) / 2
+    cylinder_radius_m = (cylinder_diam_cm / 100) / 2
+    if cylinder_radius_m <= ball_radius_m:
+        return 0
+    return (1 / (2 * math.pi)) * math.sqrt(9.81 / (cylinder_radius_m - ball_radius_m)) * 60
+
+# Includes cylinders smaller than, equal to and larger than every ball
+BALL_DIAMS = [0.1, 1.5, 5.0, 20.0, 60.0]
+CYLINDER_DIAMS = np.concatenate([np.linspace(1.0, 50.0, 50), BALL_DIAMS])
+
+@pytest.mark.parametrize('ball_diam', BALL_DIAMS)
+def test_kernels_match_baseline_formula(app, ball_diam):
+    expected = np.array([baseline_critical_speed(ball_diam, d) for d in CYLINDER_DIAMS])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        scalar = np.array([app['critical_speed'](ball_diam, d) for d in CYLINDER_DIAMS])
+        curve = app['cs_uf'](ball_diam, CYLINDER_DIAMS)
+        buffer = np.empty_like(CYLINDER_DIAMS)
+        curve_out = app['cs_uf'](ball_diam, CYLINDER_DIAMS, out=buffer)
+        numpy_curve = app['critical_speed_vec'](ball_diam, CYLINDER_DIAMS)
+    for result in (scalar, curve, curve_out, buffer, numpy_curve):
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+@pytest.mark.parametrize('ball_diam', BALL_DIAMS)
+def test_aot_kernels_match_baseline_formula(ball_diam):
+    # Only runs when build_kernels.py has been run; a stale build must not pass
+    kernels = pytest.importorskip('ballmill_kernels')
+    expected = np.array([baseline_critical_speed(ball_diam, d) for d in CYLINDER_DIAMS])
+    scalar = np.array([kernels.cs_scalar(ball_diam, d) for d in CYLINDER_DIAMS])
+    curve = np.empty_like(CYLINDER_DIAMS)
+    kernels.cs_vec(ball_diam, CYLINDER_DIAMS, curve)
+    np.testing.assert_allclose(scalar, expected, rtol=1e-12)
+    np.testing.assert_allclose(curve, expected, rtol=1e-12)
+
+@pytest.mark.parametrize('ext', ['png', 'pdf', 'svg'])
+def test_savefig(app, tmp_path, ext):
+    fig = app['fig']
+    fig.canvas.draw()
+    path = tmp_path / ('ballmill.' + ext)
+    fig.savefig(path)
+    assert path.stat().st_size > 0
+
+@pytest.mark.parametrize('resize', ['size', 'dpi'])
+def test_static_images_follow_canvas(app, resize):
+    fig = app['fig']
+    fig.canvas.draw()
+    if resize == 'size':
+        fig.set_size_inches(10, 6)
+    else:
+        fig.dpi = 200  # as a canvas does on a HiDPI screen
+    fig.canvas.draw()
+    diagram_bbox = app['ax_diagram'].bbox
+    height, width = app['diagram_image'].get_array().shape[:2]
+    assert (width, height) == pytest.approx((diagram_bbox.width, diagram_bbox.height), abs=1)
+
+@pytest.mark.parametrize('xlim', [(-300, -10), (-50, 0.0), (100, 200)])
+def test_slider_restores_panned_view(app, xlim):
+    ax = app['ax']
+    app['fig'].canvas.draw()
+    ax.set_xlim(*xlim)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        app['update'](app['ball_slider'].val)
+    assert ax.get_xlim() == pytest.approx((0, app['critical_speeds'].max() * 1.1))